@@ -0,0 +1,30 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Todo
+
+LIST_STATS_CACHE_KEY = 'todo_list:stats'
+LIST_STATS_CACHE_TIMEOUT = 30
+
+
+def get_list_stats():
+    stats = cache.get(LIST_STATS_CACHE_KEY)
+    if stats is None:
+        stats = Todo.objects.aggregate(
+            total=Count('id'),
+            resolved=Count('id', filter=Q(is_resolved=True))
+        )
+        cache.set(LIST_STATS_CACHE_KEY, stats, LIST_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+# No CACHES setting is configured, so this is Django's per-process LocMemCache.
+# Invalidation only clears the worker that handled the write; other workers can
+# show stats up to LIST_STATS_CACHE_TIMEOUT seconds old unless a shared cache
+# backend (e.g. Redis) is configured.
+def invalidate_list_cache():
+    cache.delete(LIST_STATS_CACHE_KEY)
+
+
+async def ainvalidate_list_cache():
+    await cache.adelete(LIST_STATS_CACHE_KEY)
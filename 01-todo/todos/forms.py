@@ -1,25 +1,34 @@
 from django import forms
 from .models import Todo
 
+_TITLE_WIDGET = forms.TextInput(attrs={
+    'class': 'form-control',
+    'placeholder': 'Enter todo title'
+})
+_DESCRIPTION_WIDGET = forms.Textarea(attrs={
+    'class': 'form-control',
+    'placeholder': 'Enter description (optional)',
+    'rows': 4
+})
+_DUE_DATE_WIDGET = forms.DateInput(attrs={
+    'type': 'date',
+    'class': 'form-control'
+})
+_IS_RESOLVED_WIDGET = forms.CheckboxInput(attrs={
+    'class': 'form-check-input'
+})
+
 class TodoForm(forms.ModelForm):
     class Meta:
         model = Todo
         fields = ['title', 'description', 'due_date', 'is_resolved']
         widgets = {
-            'title': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'Enter todo title'
-            }),
-            'description': forms.Textarea(attrs={
-                'class': 'form-control',
-                'placeholder': 'Enter description (optional)',
-                'rows': 4
-            }),
-            'due_date': forms.DateInput(attrs={
-                'type': 'date',
-                'class': 'form-control'
-            }),
-            'is_resolved': forms.CheckboxInput(attrs={
-                'class': 'form-check-input'
-            })
+            'title': _TITLE_WIDGET,
+            'description': _DESCRIPTION_WIDGET,
+            'due_date': _DUE_DATE_WIDGET,
+            'is_resolved': _IS_RESOLVED_WIDGET,
         }
+
+class TodoCreateForm(TodoForm):
+    class Meta(TodoForm.Meta):
+        fields = ['title', 'description', 'due_date']
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['is_resolved', 'due_date'], name='todo_resolved_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('is_resolved', False)), fields=['due_date'], name='todo_unresolved_idx'),
+        ),
+    ]
@@ -10,6 +10,10 @@ class Todo(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_resolved', 'due_date'], name='todo_resolved_due_idx'),
+            models.Index(fields=['due_date'], condition=models.Q(is_resolved=False), name='todo_unresolved_idx'),
+        ]
 
     def __str__(self):
         return self.title
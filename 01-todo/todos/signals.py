@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_list_cache
+from .models import Todo
+
+
+@receiver(post_save, sender=Todo)
+@receiver(post_delete, sender=Todo)
+def todo_changed(sender, **kwargs):
+    # Wait for the commit so a concurrent reader can't re-cache the old stats
+    transaction.on_commit(invalidate_list_cache)
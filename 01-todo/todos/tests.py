@@ -1,14 +1,28 @@
-from django.test import TestCase, Client
+import functools
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from datetime import date, timedelta
 from .models import Todo
-from .forms import TodoForm
+from .forms import TodoCreateForm, TodoForm
+from .views import TodoCreateView
+
+
+@functools.lru_cache(maxsize=None)
+def _reverse(name, pk=None):
+    # Resolve each URL once for the whole run
+    return reverse(name, kwargs={'pk': pk} if pk is not None else None)
 
 
 class TodoModelTest(TestCase):
-    def setUp(self):
-        self.todo = Todo.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.todo = Todo.objects.create(
             title="Test Todo",
             description="Test description",
             due_date=date.today() + timedelta(days=7)
@@ -40,11 +54,17 @@ class TodoModelTest(TestCase):
 
 
 class TodoListViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.url = _reverse('todo_list')
+        Todo.objects.bulk_create([
+            Todo(title="Todo 1", description="First todo"),
+            Todo(title="Todo 2", is_resolved=True),
+        ])
+
     def setUp(self):
-        self.client = Client()
-        self.url = reverse('todo_list')
-        Todo.objects.create(title="Todo 1", description="First todo")
-        Todo.objects.create(title="Todo 2", is_resolved=True)
+        # Rolled-back writes never invalidate the cached stats, so start each test empty
+        cache.clear()
 
     def test_list_view_status_code(self):
         response = self.client.get(self.url)
@@ -63,11 +83,77 @@ class TodoListViewTest(TestCase):
         response = self.client.get(self.url)
         self.assertEqual(len(response.context['todos']), 2)
 
+    def test_list_view_stats(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['total_todos'], 2)
+        self.assertEqual(response.context['resolved_todos'], 1)
+        self.assertEqual(response.context['completion_percentage'], 50)
+
+    def test_list_view_truncates_long_description(self):
+        Todo.objects.create(title="Long", description="x" * 300)
+        response = self.client.get(self.url)
+        self.assertContains(response, "x" * 199 + "\u2026")
+        self.assertNotContains(response, "x" * 201)
+
+    def test_list_view_pagination(self):
+        Todo.objects.bulk_create(Todo(title=f"Extra {i}") for i in range(49))
+        response = self.client.get(self.url)
+        self.assertTrue(response.context['is_paginated'])
+        self.assertEqual(len(response.context['todos']), 50)
+        self.assertEqual(response.context['total_todos'], 51)
+        self.assertEqual(response.context['resolved_todos'], 1)
+        response = self.client.get(self.url, {'page': 2})
+        self.assertEqual(len(response.context['todos']), 1)
+        self.assertContains(response, 'name="page" value="2"')
+
+    def test_list_view_pagination_with_equal_timestamps(self):
+        Todo.objects.bulk_create(Todo(title=f"Extra {i}") for i in range(49))
+        Todo.objects.update(created_at=timezone.now())
+        pks = []
+        for page in (1, 2):
+            response = self.client.get(self.url, {'page': page})
+            pks += [todo.pk for todo in response.context['todos']]
+        self.assertEqual(pks, sorted(Todo.objects.values_list('pk', flat=True), reverse=True))
+
+    def test_list_view_reflects_toggle(self):
+        Todo.objects.bulk_create(Todo(title=f"Extra {i}") for i in range(49))
+        self.client.get(self.url)
+        todo = Todo.objects.get(title="Todo 1")
+        self.client.post(_reverse('todo_toggle', todo.pk))
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['resolved_todos'], 2)
+
+    def test_list_view_reflects_save(self):
+        Todo.objects.bulk_create(Todo(title=f"Extra {i}") for i in range(49))
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Todo.objects.create(title="New", is_resolved=True)
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['total_todos'], 52)
+        self.assertEqual(response.context['resolved_todos'], 2)
+
+    def test_list_view_not_cached_by_browser(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('max-age', response.get('Cache-Control', ''))
+        self.assertFalse(response.has_header('Expires'))
+
+    def test_list_view_toggle_forms_work_for_each_client(self):
+        todo = Todo.objects.get(title="Todo 1")
+        clients = [Client(enforce_csrf_checks=True), Client(enforce_csrf_checks=True)]
+        # Load the page in both clients before either posts
+        tokens = [
+            re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', client.get(self.url).content.decode()).group(1)
+            for client in clients
+        ]
+        for client, token in zip(clients, tokens):
+            response = client.post(_reverse('todo_toggle', todo.pk), {'csrfmiddlewaretoken': token})
+            self.assertEqual(response.status_code, 302)
+
 
 class TodoCreateViewTest(TestCase):
     def setUp(self):
-        self.client = Client()
-        self.url = reverse('todo_create')
+        self.url = _reverse('todo_create')
+        self.factory = RequestFactory()
 
     def test_create_view_status_code(self):
         response = self.client.get(self.url)
@@ -95,20 +181,22 @@ class TodoCreateViewTest(TestCase):
         self.assertEqual(Todo.objects.count(), 1)
 
     def test_create_todo_without_title_fails(self):
+        # Dispatch straight to the view; this test needs no middleware
         data = {'description': 'No title'}
-        response = self.client.post(self.url, data)
+        request = self.factory.post(self.url, data)
+        response = TodoCreateView.as_view()(request)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(Todo.objects.count(), 0)
 
 
 class TodoUpdateViewTest(TestCase):
-    def setUp(self):
-        self.client = Client()
-        self.todo = Todo.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.todo = Todo.objects.create(
             title="Original Title",
             description="Original description"
         )
-        self.url = reverse('todo_update', kwargs={'pk': self.todo.pk})
+        cls.url = _reverse('todo_update', cls.todo.pk)
 
     def test_update_view_status_code(self):
         response = self.client.get(self.url)
@@ -129,6 +217,42 @@ class TodoUpdateViewTest(TestCase):
         self.todo.refresh_from_db()
         self.assertEqual(self.todo.title, 'Updated Title')
 
+    def test_update_todo_writes_only_changed_fields(self):
+        updated_at = self.todo.updated_at
+        data = {
+            'title': 'Updated Title',
+            'description': 'Original description'
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 302)
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"title"', updates[0])
+        self.assertNotIn('"description"', updates[0])
+        self.assertNotIn('"is_resolved"', updates[0])
+        self.todo.refresh_from_db()
+        self.assertEqual(self.todo.title, 'Updated Title')
+        self.assertGreater(self.todo.updated_at, updated_at)
+
+    def test_update_todo_clears_fields(self):
+        Todo.objects.filter(pk=self.todo.pk).update(is_resolved=True)
+        response = self.client.post(self.url, {'title': 'Original Title'})
+        self.assertEqual(response.status_code, 302)
+        self.todo.refresh_from_db()
+        self.assertFalse(self.todo.is_resolved)
+        self.assertEqual(self.todo.description, '')
+
+    def test_update_todo_without_changes_skips_save(self):
+        data = {
+            'title': 'Original Title',
+            'description': 'Original description'
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(any(q['sql'].startswith('UPDATE') for q in queries))
+
     def test_update_todo_mark_resolved(self):
         data = {
             'title': 'Original Title',
@@ -141,10 +265,10 @@ class TodoUpdateViewTest(TestCase):
 
 
 class TodoDeleteViewTest(TestCase):
-    def setUp(self):
-        self.client = Client()
-        self.todo = Todo.objects.create(title="To Delete")
-        self.url = reverse('todo_delete', kwargs={'pk': self.todo.pk})
+    @classmethod
+    def setUpTestData(cls):
+        cls.todo = Todo.objects.create(title="To Delete")
+        cls.url = _reverse('todo_delete', cls.todo.pk)
 
     def test_delete_view_status_code(self):
         response = self.client.get(self.url)
@@ -161,13 +285,13 @@ class TodoDeleteViewTest(TestCase):
 
 
 class TodoToggleResolvedTest(TestCase):
-    def setUp(self):
-        self.client = Client()
-        self.todo = Todo.objects.create(title="Toggle Test", is_resolved=False)
-        self.url = reverse('todo_toggle', kwargs={'pk': self.todo.pk})
+    @classmethod
+    def setUpTestData(cls):
+        cls.todo = Todo.objects.create(title="Toggle Test", is_resolved=False)
+        cls.url = _reverse('todo_toggle', cls.todo.pk)
 
     def test_toggle_resolved_from_false_to_true(self):
-        response = self.client.get(self.url)
+        response = self.client.post(self.url)
         self.assertEqual(response.status_code, 302)
         self.todo.refresh_from_db()
         self.assertTrue(self.todo.is_resolved)
@@ -175,10 +299,37 @@ class TodoToggleResolvedTest(TestCase):
     def test_toggle_resolved_from_true_to_false(self):
         self.todo.is_resolved = True
         self.todo.save()
+        response = self.client.post(self.url)
+        self.todo.refresh_from_db()
+        self.assertFalse(self.todo.is_resolved)
+
+    def test_toggle_resolved_twice_restores_state(self):
+        self.client.post(self.url)
+        self.client.post(self.url)
+        self.todo.refresh_from_db()
+        self.assertFalse(self.todo.is_resolved)
+
+    def test_toggle_resolved_is_a_single_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url)
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('UPDATE'))
+
+    def test_toggle_resolved_keeps_page(self):
+        response = self.client.post(self.url, {'page': '2'})
+        self.assertRedirects(response, _reverse('todo_list') + '?page=2', fetch_redirect_response=False)
+
+    def test_toggle_resolved_requires_post(self):
         response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
         self.todo.refresh_from_db()
         self.assertFalse(self.todo.is_resolved)
 
+    def test_toggle_resolved_missing_todo(self):
+        url = _reverse('todo_toggle', self.todo.pk + 1)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 404)
+
 
 class TodoFormTest(TestCase):
     def test_form_valid_with_all_fields(self):
@@ -205,3 +356,7 @@ class TodoFormTest(TestCase):
     def test_form_widget_types(self):
         form = TodoForm()
         self.assertEqual(form.fields['due_date'].widget.input_type, 'date')
+
+    def test_create_form_excludes_is_resolved(self):
+        form = TodoCreateForm()
+        self.assertNotIn('is_resolved', form.fields)
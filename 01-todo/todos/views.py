@@ -1,18 +1,42 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.urls import reverse_lazy
+from django.db.models import F
+from django.db.models.functions import Substr
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import render, redirect
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from .cache import ainvalidate_list_cache, get_list_stats
 from .models import Todo
-from .forms import TodoForm
+from .forms import TodoCreateForm, TodoForm
+
+DESCRIPTION_PREVIEW_LENGTH = 200
 
 class TodoListView(ListView):
     model = Todo
     template_name = 'todos/todo_list.html'
     context_object_name = 'todos'
+    paginate_by = 50
+
+    def get_queryset(self):
+        # Only the columns the list template renders; the full description is
+        # replaced by a prefix just long enough for truncatechars to mark a cut
+        return Todo.objects.only('title', 'due_date', 'is_resolved', 'created_at').annotate(
+            description_preview=Substr('description', 1, DESCRIPTION_PREVIEW_LENGTH + 1)
+        ).order_by('-created_at', '-pk')  # pk breaks created_at ties so pages never overlap
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        total_todos = self.get_queryset().count()
-        resolved_todos = self.get_queryset().filter(is_resolved=True).count()
+        if not context['is_paginated']:
+            # The whole list is already loaded, so count it in Python
+            todos = context['todos']
+            total_todos = len(todos)
+            resolved_todos = sum(1 for todo in todos if todo.is_resolved)
+        else:
+            stats = get_list_stats()
+            total_todos = stats['total']
+            resolved_todos = stats['resolved']
+        context['description_preview_length'] = DESCRIPTION_PREVIEW_LENGTH
         context['total_todos'] = total_todos
         context['resolved_todos'] = resolved_todos
         context['completion_percentage'] = int((resolved_todos / total_todos * 100)) if total_todos > 0 else 0
@@ -21,27 +45,49 @@ class TodoListView(ListView):
 class TodoCreateView(CreateView):
     model = Todo
     template_name = 'todos/todo_form.html'
-    form_class = TodoForm
+    form_class = TodoCreateForm
     success_url = reverse_lazy('todo_list')
 
-    def get_form(self, form_class=None):
-        form = super().get_form(form_class)
-        form.fields.pop('is_resolved', None)
-        return form
-
 class TodoUpdateView(UpdateView):
     model = Todo
     template_name = 'todos/todo_form.html'
     form_class = TodoForm
     success_url = reverse_lazy('todo_list')
 
+    def get_queryset(self):
+        return Todo.objects.only('title', 'description', 'due_date', 'is_resolved')
+
+    def form_valid(self, form):
+        # Only write the columns the user actually changed.
+        # Revisit this if a save signal ever depends on other fields.
+        self.object = form.save(commit=False)
+        if form.changed_data:
+            self.object.save(update_fields=[*form.changed_data, 'updated_at'])
+        return HttpResponseRedirect(self.get_success_url())
+
 class TodoDeleteView(DeleteView):
     model = Todo
     template_name = 'todos/todo_confirm_delete.html'
     success_url = reverse_lazy('todo_list')
 
-def toggle_resolved(request, pk):
-    todo = get_object_or_404(Todo, pk=pk)
-    todo.is_resolved = not todo.is_resolved
-    todo.save()
+    def get_queryset(self):
+        # The confirmation page only shows the title
+        return Todo.objects.only('title')
+
+@require_POST
+async def toggle_resolved(request, pk):
+    # Flip the flag in a single atomic UPDATE so concurrent toggles can't lose a flip.
+    # update() skips auto_now, so bump updated_at here.
+    updated = await Todo.objects.filter(pk=pk).aupdate(
+        is_resolved=~F('is_resolved'),
+        updated_at=timezone.now()
+    )
+    if not updated:
+        raise Http404('No Todo matches the given query.')
+    # update() sends no post_save signal, so invalidate the cached stats directly
+    await ainvalidate_list_cache()
+    # Send the user back to the page they toggled from
+    page = request.POST.get('page', '')
+    if page.isdigit() and page != '1':
+        return redirect(f"{reverse('todo_list')}?page={page}")
     return redirect('todo_list')